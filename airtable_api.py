@@ -1,19 +1,68 @@
-import os
+import orjson
 import requests
 import logging
-from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from http_retry import build_retry_policy
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
 
 class AirtableAPI:
-    def __init__(self, api_key, base_id, table_name):
+    # Nombre maximum d'enregistrements acceptés par requête d'écriture Airtable
+    BATCH_SIZE = 10
+    # Taille maximale d'une page de résultats (limite imposée par Airtable)
+    PAGE_SIZE = 100
+    # Nouvelles tentatives sur les erreurs temporaires (limitation de débit, erreurs serveur)
+    MAX_RETRIES = 3
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    MAX_RETRY_WAIT = 30
+    # Connexions conservées ouvertes vers Airtable (au moins une par thread de synchronisation)
+    POOL_SIZE = 10
+    
+    def __init__(self, api_key, base_id, table_name, connect_timeout=3.05, read_timeout=30):
         self.api_key = api_key
         self.base_id = base_id
         self.table_name = table_name
+        # Délais (connexion, lecture) : une connexion bloquée ne doit pas figer un thread
+        self.timeout = (connect_timeout, read_timeout)
         self.base_url = f"https://api.airtable.com/v0/{base_id}/{table_name}"
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
         self.logger = logging.getLogger('SellsySynchronizer')
+        
+        # Session partagée : les connexions TCP/TLS sont réutilisées entre les requêtes
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.POOL_SIZE,
+            max_retries=self._retry_policy()
+        ))
+    
+    def _retry_policy(self) -> Retry:
+        """Politique de nouvelles tentatives de la session Airtable (lectures, créations et mises à jour par lot)."""
+        return build_retry_policy(self.MAX_RETRIES, self.RETRY_STATUS_CODES, self.MAX_RETRY_WAIT,
+                                  allowed_methods=("GET", "POST", "PATCH"))
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Exécute une requête Airtable.
+        
+        Les erreurs temporaires (429, 5xx) sont rejouées par la session HTTP.
+        
+        Args:
+            method: Méthode HTTP
+            url: URL de la requête
+            **kwargs: Arguments transmis à Session.request
+            
+        Returns:
+            Dernière réponse reçue
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
     
     def get_records(self, filter_formula=None, limit=None) -> List[Dict]:
         """
@@ -26,67 +75,108 @@ class AirtableAPI:
         Returns:
             Liste des enregistrements
         """
-        records = []
-        offset = None
+        return list(self.iter_records(filter_formula, limit))
+    
+    def iter_records(self, filter_formula=None, limit=None) -> Iterator[Dict]:
+        """
+        Parcourt les enregistrements d'Airtable page par page.
+        
+        La page suivante est téléchargée en arrière-plan pendant que
+        l'appelant traite les enregistrements de la page courante.
+        
+        Args:
+            filter_formula: Formule de filtrage Airtable (ex: "BLANK({ID_Sellsy})")
+            limit: Nombre maximum d'enregistrements à récupérer (optionnel)
+            
+        Yields:
+            Enregistrements Airtable
+        """
+        count = 0
         
         self.logger.info(f"🔄 Récupération des enregistrements Airtable" + 
                         (f" avec filtre: {filter_formula}" if filter_formula else "") +
                         (f" (limité à {limit})" if limit else ""))
         
+        executor = ThreadPoolExecutor(max_workers=1)
         try:
-            while True:
-                params = {}
-                if offset:
-                    params["offset"] = offset
-                
-                # Ajout du filtre si spécifié
-                if filter_formula:
-                    params["filterByFormula"] = filter_formula
-                
-                # Ajout de la limite si spécifiée
-                if limit:
-                    params["maxRecords"] = limit
-                
-                self.logger.debug(f"URL de requête: {self.base_url}")
-                self.logger.debug(f"Paramètres: {params}")
-                
-                response = requests.get(
-                    self.base_url, 
-                    headers=self.headers, 
-                    params=params
-                )
-                
-                if response.status_code != 200:
-                    self.logger.error(f"❌ Erreur API Airtable {response.status_code}: {response.text}")
-                    return []
-                
-                data = response.json()
+            next_page = executor.submit(self._get_page, filter_formula, limit, None)
+            
+            while next_page is not None:
+                data = next_page.result()
+                if data is None:
+                    return
                 
                 page_records = data.get("records", [])
-                self.logger.debug(f"Récupération de {len(page_records)} enregistrements dans cette page")
-                records.extend(page_records)
+                self.logger.debug("Récupération de %d enregistrements dans cette page", len(page_records))
                 
-                # Si une limite est définie et atteinte, arrêtons-nous
-                if limit and len(records) >= limit:
-                    records = records[:limit]  # Assurons-nous de ne pas dépasser la limite
-                    break
+                # Si une limite est définie, ne pas la dépasser
+                if limit:
+                    page_records = page_records[:limit - count]
+                count += len(page_records)
                 
+                # Lancement du téléchargement de la page suivante avant de traiter celle-ci
                 offset = data.get("offset")
-                if not offset:
-                    break
+                if offset and not (limit and count >= limit):
+                    next_page = executor.submit(self._get_page, filter_formula, limit, offset)
+                else:
+                    next_page = None
                 
-            self.logger.info(f"✅ {len(records)} enregistrements récupérés au total")
-            return records
+                yield from page_records
+            
+            self.logger.info(f"✅ {count} enregistrements récupérés au total")
+            
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _get_page(self, filter_formula=None, limit=None, offset=None) -> Optional[Dict]:
+        """
+        Récupère une page d'enregistrements Airtable.
+        
+        Args:
+            filter_formula: Formule de filtrage Airtable (optionnel)
+            limit: Nombre maximum d'enregistrements à récupérer (optionnel)
+            offset: Curseur de pagination renvoyé par la page précédente (optionnel)
+            
+        Returns:
+            Réponse de l'API Airtable ou None en cas d'erreur
+        """
+        params = {"pageSize": self.PAGE_SIZE}
+        if offset:
+            params["offset"] = offset
+        
+        # Ajout du filtre si spécifié
+        if filter_formula:
+            params["filterByFormula"] = filter_formula
+        
+        # Ajout de la limite si spécifiée
+        if limit:
+            params["maxRecords"] = limit
+        
+        self.logger.debug("URL de requête: %s", self.base_url)
+        self.logger.debug("Paramètres: %s", params)
+        
+        try:
+            response = self._request(
+                "GET",
+                self.base_url, 
+                params=params
+            )
+            
+            if response.status_code != 200:
+                self.logger.error(f"❌ Erreur API Airtable {response.status_code}: {response.text}")
+                return None
+            
+            return orjson.loads(response.content)
             
         except requests.RequestException as e:
             self.logger.error(f"❌ Erreur lors de la requête Airtable: {str(e)}")
             if hasattr(e, 'response') and e.response:
                 self.logger.error(f"Status code: {e.response.status_code}")
                 self.logger.error(f"Détails: {e.response.text}")
-            return []
+            return None
         except Exception as e:
             self.logger.error(f"❌ Erreur inattendue lors de la récupération des enregistrements: {str(e)}")
-            return []
+            return None
     
     def update_record(self, record_id: str, fields: Dict) -> Dict:
         """
@@ -100,12 +190,12 @@ class AirtableAPI:
             Réponse de l'API Airtable
         """
         try:
-            self.logger.debug(f"Mise à jour de l'enregistrement {record_id} avec les champs: {fields}")
+            self.logger.debug("Mise à jour de l'enregistrement %s avec les champs: %s", record_id, fields)
             
-            response = requests.patch(
+            response = self._request(
+                "PATCH",
                 f"{self.base_url}/{record_id}", 
-                headers=self.headers, 
-                json={"fields": fields}
+                data=orjson.dumps({"fields": fields})
             )
             
             if response.status_code != 200:
@@ -113,12 +203,55 @@ class AirtableAPI:
                 return None
             
             self.logger.info(f"✅ Enregistrement {record_id} mis à jour avec succès")
-            return response.json()
+            return orjson.loads(response.content)
             
         except Exception as e:
             self.logger.error(f"❌ Erreur lors de la mise à jour de l'enregistrement: {str(e)}")
             return None
-    
+
+    def update_records(self, updates: List[Dict]) -> List[Dict]:
+        """
+        Met à jour plusieurs enregistrements dans Airtable par lots.
+
+        L'API Airtable accepte jusqu'à 10 enregistrements par requête PATCH,
+        ce qui divise d'autant le nombre d'appels réseau.
+
+        Args:
+            updates: Liste de dictionnaires {"id": ..., "fields": {...}}
+
+        Returns:
+            Liste des enregistrements mis à jour avec succès
+        """
+        updated = []
+        iterator = iter(updates)
+
+        while True:
+            batch = list(islice(iterator, self.BATCH_SIZE))
+            if not batch:
+                break
+
+            try:
+                self.logger.debug("Mise à jour groupée de %d enregistrements", len(batch))
+
+                response = self._request(
+                    "PATCH",
+                    self.base_url,
+                    data=orjson.dumps({"records": batch})
+                )
+
+                if response.status_code != 200:
+                    self.logger.error(f"❌ Erreur lors de la mise à jour groupée {response.status_code}: {response.text}")
+                    continue
+
+                batch_records = orjson.loads(response.content).get("records", [])
+                updated.extend(batch_records)
+                self.logger.info(f"✅ {len(batch_records)} enregistrements mis à jour avec succès")
+
+            except Exception as e:
+                self.logger.error(f"❌ Erreur lors de la mise à jour groupée des enregistrements: {str(e)}")
+
+        return updated
+
     def create_record(self, fields: Dict) -> Dict:
         """
         Crée un nouvel enregistrement dans Airtable.
@@ -130,12 +263,12 @@ class AirtableAPI:
             Réponse de l'API Airtable
         """
         try:
-            self.logger.debug(f"Création d'un nouvel enregistrement avec les champs: {fields}")
+            self.logger.debug("Création d'un nouvel enregistrement avec les champs: %s", fields)
             
-            response = requests.post(
+            response = self._request(
+                "POST",
                 self.base_url, 
-                headers=self.headers, 
-                json={"fields": fields}
+                data=orjson.dumps({"fields": fields})
             )
             
             if response.status_code != 200:
@@ -143,8 +276,12 @@ class AirtableAPI:
                 return None
                 
             self.logger.info(f"✅ Nouvel enregistrement créé avec succès")
-            return response.json()
+            return orjson.loads(response.content)
             
         except Exception as e:
             self.logger.error(f"❌ Erreur lors de la création de l'enregistrement: {str(e)}")
             return None
+
+    def close(self):
+        """Ferme la session HTTP et libère les connexions du pool."""
+        self.session.close()
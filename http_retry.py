@@ -0,0 +1,49 @@
+from typing import Iterable, Tuple
+from urllib3.util.retry import Retry
+
+class CreateSafeRetry(Retry):
+    """
+    Politique urllib3 qui ne rejoue une création (POST) qu'après un refus 429.
+
+    Un 429 garantit que le serveur n'a pas traité la requête ; après une erreur 5xx
+    l'objet a pu être créé, le renvoyer risquerait un doublon.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method == "POST" and status_code != 429:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+def build_retry_policy(max_retries: int, status_codes: Tuple[int, ...], max_wait: float,
+                       allowed_methods: Iterable[str]) -> Retry:
+    """
+    Construit la politique de nouvelles tentatives d'une session HTTP.
+
+    Les échecs de connexion et les réponses listées dans status_codes sont
+    rejoués avec un backoff exponentiel aléatoire, en respectant l'en-tête
+    Retry-After. Un dépassement du délai de lecture n'est pas rejoué : le
+    ReadTimeout remonte tel quel à l'appelant, seul à savoir si la requête
+    peut être renvoyée.
+
+    Args:
+        max_retries: Nombre maximal de nouvelles tentatives
+        status_codes: Codes HTTP considérés comme temporaires
+        max_wait: Attente maximale entre deux tentatives (secondes)
+        allowed_methods: Méthodes HTTP pouvant être rejouées
+
+    Returns:
+        Configuration urllib3 à passer à HTTPAdapter(max_retries=...)
+    """
+    return CreateSafeRetry(
+        total=max_retries,
+        connect=max_retries,
+        read=False,
+        status=max_retries,
+        status_forcelist=status_codes,
+        allowed_methods=frozenset(allowed_methods),
+        backoff_factor=1,
+        backoff_max=max_wait,
+        backoff_jitter=0.5,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
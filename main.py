@@ -1,48 +1,78 @@
 import os
+import re
 import sys
 import time
-import json
+import orjson
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-from typing import Dict, List, Optional
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
 # Import des classes API
 from sellsy_api import SellsyAPI
 from airtable_api import AirtableAPI
+from sync_cache import SyncCache
+from token_cache import TokenCache
 
 # Charger les variables d'environnement depuis un fichier .env si présent
 load_dotenv()
 
+# Format d'email minimal accepté par Sellsy (évite un appel API voué à l'échec)
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
 def setup_logging():
     """Configure et initialise le système de journalisation."""
+    logger = logging.getLogger('SellsySynchronizer')
+    
+    # Déjà configuré (module importé plusieurs fois) : ne pas empiler de nouveaux handlers
+    if logger.handlers:
+        return logger
+    
     log_dir = 'logs'
     os.makedirs(log_dir, exist_ok=True)
-    log_filename = os.path.join(log_dir, f'sync_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
+    log_filename = os.path.join(log_dir, f'sync_{time.strftime("%Y%m%d_%H%M%S")}.log')
 
-    logger = logging.getLogger('SellsySynchronizer')
-    logger.setLevel(logging.DEBUG)
+    # Niveau de journalisation configurable (DEBUG pour diagnostiquer une synchronisation)
+    log_level = getattr(logging, os.environ.get("LOG_LEVEL", "INFO").upper(), logging.INFO)
+
+    logger.setLevel(log_level)
+    # Pas de remontée vers le logger racine : évite un second formatage des messages
+    logger.propagate = False
 
-    formatter = logging.Formatter(
+    # Format détaillé (fichier:ligne) pour le fichier, format court pour la console
+    file_formatter = logging.Formatter(
         '%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
+    console_formatter = logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
 
     file_handler = RotatingFileHandler(
         log_filename, 
-        maxBytes=10*1024*1024,  
-        backupCount=5
+        maxBytes=50*1024*1024,  # Assez grand pour qu'une exécution ne déclenche pas de rotation
+        backupCount=10
     )
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
+    file_handler.setLevel(log_level)
+    file_handler.setFormatter(file_formatter)
 
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.DEBUG)
-    console_handler.setFormatter(formatter)
+    console_handler.setLevel(log_level)
+    console_handler.setFormatter(console_formatter)
+
+    # Les écritures (fichier et console) sont déléguées à un thread dédié
+    # pour ne pas bloquer la synchronisation sur les entrées/sorties
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
     return logger
 
@@ -59,10 +89,33 @@ class Config:
     SELLSY_CLIENT_SECRET = os.environ.get("SELLSY_CLIENT_SECRET")
     SELLSY_ACCESS_TOKEN = os.environ.get("SELLSY_ACCESS_TOKEN", None)  # Optionnel
     SELLSY_REFRESH_TOKEN = os.environ.get("SELLSY_REFRESH_TOKEN", None)  # Optionnel
+    # Fichier de cache du token d'accès, réutilisé entre deux exécutions
+    SELLSY_TOKEN_CACHE_PATH = os.environ.get(
+        "SELLSY_TOKEN_CACHE_PATH", os.path.expanduser("~/.cache/sellsy/token.json")
+    )
+    
+    # Nombre de clients synchronisés en parallèle
+    SYNC_MAX_WORKERS = int(os.environ.get("SYNC_MAX_WORKERS", "4"))
+    
+    # Cache local des clients déjà créés dans Sellsy (reprise après interruption)
+    SYNC_CACHE_PATH = os.environ.get("SYNC_CACHE_PATH", ".sync_cache.sqlite")
+    
+    # Rattacher les enregistrements à un client Sellsy existant de même email au lieu d'en créer un nouveau
+    SELLSY_MATCH_BY_EMAIL = os.environ.get("SELLSY_MATCH_BY_EMAIL", "false").lower() == "true"
 
 class ClientSynchronizer:
     """Classe pour synchroniser les clients entre Airtable et Sellsy."""
     
+    # Champs Airtable obligatoires selon le type de client
+    COMPANY_REQUIRED_FIELDS = (
+        'Nom de l\'entreprise', 'Email', 
+        'Adresse complète', 'Code postal', 'Ville'
+    )
+    INDIVIDUAL_REQUIRED_FIELDS = (
+        'Nom', 'Prenom', 'Email', 
+        'Adresse complète', 'Code postal', 'Ville'
+    )
+    
     def __init__(self):
         """Initialise les API clients."""
         # Vérification et initialisation des clés API
@@ -88,16 +141,52 @@ class ClientSynchronizer:
             Config.SELLSY_CLIENT_SECRET,
             Config.SELLSY_ACCESS_TOKEN,
             Config.SELLSY_REFRESH_TOKEN,
-            logger
+            logger,
+            token_cache=TokenCache(Config.SELLSY_TOKEN_CACHE_PATH)
         )
         
         # Test de l'authentification Sellsy
         if not self.test_sellsy_connection():
             logger.error("❌ Échec de la connexion à l'API Sellsy")
+            self.airtable_api.close()
+            self.sellsy_api.close()
             raise ConnectionError("L'authentification Sellsy a échoué")
         
-        # Stockage temporaire du résultat de synchronisation
-        self.sync_result = None
+        # Champ Airtable contenant l'ID Sellsy (identifié au démarrage)
+        self.sellsy_id_field = "ID_Sellsy"
+        
+        # Clients créés lors d'une exécution précédente mais pas encore reportés dans Airtable
+        self.sync_cache = SyncCache(Config.SYNC_CACHE_PATH)
+        
+        # Clients Sellsy existants par (type, email) (chargés seulement si SELLSY_MATCH_BY_EMAIL est activé)
+        self.existing_clients: Optional[Dict[Tuple[str, str], str]] = None
+    
+    def close(self):
+        """Libère les connexions HTTP et le cache de synchronisation."""
+        self.airtable_api.close()
+        self.sellsy_api.close()
+        self.sync_cache.close()
+    
+    def load_existing_clients(self) -> int:
+        """
+        Charge en une seule passe les clients Sellsy existants, indexés par type et email.
+        
+        Chaque enregistrement est ensuite comparé localement à cet index,
+        sans requête de recherche par enregistrement.
+        
+        Returns:
+            Nombre de clients indexés
+        """
+        logger.info("🔄 Chargement des clients Sellsy existants")
+        existing_clients = {}
+        for client in self.sellsy_api.iter_clients():
+            email = str(client.get("email") or "").strip().lower()
+            if email and client.get("id"):
+                existing_clients.setdefault((client["client_type"], email), str(client["id"]))
+        
+        self.existing_clients = existing_clients
+        logger.info(f"✅ {len(existing_clients)} clients Sellsy existants indexés par type et email")
+        return len(existing_clients)
     
     def test_sellsy_connection(self) -> bool:
         """
@@ -122,35 +211,22 @@ class ClientSynchronizer:
         # Vérifier d'abord si c'est une entreprise ou un particulier
         nom_entreprise = str(record_fields.get("Nom de l'entreprise", "")).strip()
         
-        if nom_entreprise:
-            # Pour les entreprises : pas besoin de Nom/Prénom individuels
-            required_fields = [
-                'Nom de l\'entreprise', 'Email', 
-                'Adresse complète', 'Code postal', 'Ville'
-            ]
-        else:
-            # Pour les particuliers : Nom et Prénom sont requis
-            required_fields = [
-                'Nom', 'Prenom', 'Email', 
-                'Adresse complète', 'Code postal', 'Ville'
-            ]
+        # Pour les entreprises, pas besoin de Nom/Prénom individuels
+        required_fields = self.COMPANY_REQUIRED_FIELDS if nom_entreprise else self.INDIVIDUAL_REQUIRED_FIELDS
         
         # Vérifie que tous les champs requis sont présents et non vides
-        missing_fields = []
-        for field in required_fields:
-            if field not in record_fields or not record_fields[field]:
-                missing_fields.append(field)
+        missing_fields = [field for field in required_fields if not record_fields.get(field)]
         
         if missing_fields:
             logger.warning(f"⚠️ Champs manquants ou vides : {', '.join(missing_fields)}")
             return None
         
         # Nettoyage des données communes
-        email = str(record_fields["Email"]).strip()
+        email, adresse, code_postal, ville = (
+            str(record_fields[field]).strip()
+            for field in ("Email", "Adresse complète", "Code postal", "Ville")
+        )
         telephone = str(record_fields.get("Téléphone", "")).strip() if record_fields.get("Téléphone") else ""
-        adresse = str(record_fields["Adresse complète"]).strip()
-        code_postal = str(record_fields["Code postal"]).strip()
-        ville = str(record_fields["Ville"]).strip()
         
         # Récupération du champ pays s'il existe, sinon "FR" par défaut
         pays_code = str(record_fields.get("Pays", "FR")).strip()
@@ -182,151 +258,119 @@ class ClientSynchronizer:
         contrat_abonne = str(record_fields.get("Contrat abonné", "")).strip()
         
         # Vérification du format de l'email
-        if "@" not in email:
+        if not _EMAIL_RE.match(email):
             logger.warning(f"⚠️ Format d'email invalide: {email}")
             return None
         
         # Format pour l'API Sellsy V2 selon le type de client
         if nom_entreprise:
             # C'est une entreprise - pas de contact individuel
-            client_data = {
-                "third": {
-                    "name": nom_entreprise,
-                    "email": email,
-                    "type": "corporation"
-                },
-                "contact": {
-                    "name": nom_entreprise,
-                    "firstname": "",
-                    "email": email,
-                    "position": "Entreprise"
-                },
-                "address": {
-                    "name": "Adresse principale",
-                    "address_line_1": adresse,
-                    "address_line_2": adresse_ligne_2,
-                    "postal_code": code_postal,
-                    "city": ville,
-                    "country": {
-                        "code": pays_code
-                    },
-                    "is_invoicing_address": True,
-                    "is_delivery_address": True,
-                    "is_main": True
-                }
-            }
-            
-            # Ajouter le téléphone seulement s'il est présent
-            if telephone:
-                client_data["third"]["tel"] = telephone
-                client_data["contact"]["tel"] = telephone
+            third = {"name": nom_entreprise, "email": email, "type": "corporation"}
+            contact = {"name": nom_entreprise, "firstname": "", "email": email, "position": "Entreprise"}
             
             siret = str(record_fields.get("SIRET", "")).strip()
             if siret:
-                client_data["third"]["siret"] = siret
+                third["siret"] = siret
             
-            # Ajout du champ installateur si présent
-            if installateur:
-                client_data["third"]["installateur"] = installateur
-
-            # Ajout du champ puissance en kWc si présent
-            if puissance_kwc:
-                client_data["third"]["puissance_en_kwc"] = puissance_kwc
-
-            # Ajout de la référence si présente
-            if contrat_abonne:
-                client_data["third"]["contrat_abonne"] = contrat_abonne
-                
-            logger.info(f"✅ Données entreprise validées pour {nom_entreprise}")
+            libelle = nom_entreprise
         else:
             # C'est un particulier
             nom = str(record_fields["Nom"]).strip()
             prenom = str(record_fields["Prenom"]).strip()
             
-            client_data = {
-                "third": {
-                    "name": f"{prenom} {nom}",
-                    "email": email,
-                    "type": "person"
-                },
-                "contact": {
-                    "name": nom,
-                    "firstname": prenom,
-                    "email": email,
-                    "position": "Client"
+            third = {"name": f"{prenom} {nom}", "email": email, "type": "person"}
+            contact = {"name": nom, "firstname": prenom, "email": email, "position": "Client"}
+            libelle = f"{prenom} {nom}"
+        
+        # Ajouter le téléphone seulement s'il est présent
+        if telephone:
+            third["tel"] = telephone
+            contact["tel"] = telephone
+        
+        # Champs optionnels (installateur, puissance en kWc, référence) ajoutés seulement s'ils sont présents
+        for key, value in (("installateur", installateur),
+                           ("puissance_en_kwc", puissance_kwc),
+                           ("contrat_abonne", contrat_abonne)):
+            if value:
+                third[key] = value
+        
+        client_data = {
+            "third": third,
+            "contact": contact,
+            "address": {
+                "name": "Adresse principale",
+                "address_line_1": adresse,
+                "address_line_2": adresse_ligne_2,
+                "postal_code": code_postal,
+                "city": ville,
+                "country": {
+                    "code": pays_code
                 },
-                "address": {
-                    "name": "Adresse principale",
-                    "address_line_1": adresse,
-                    "address_line_2": adresse_ligne_2,
-                    "postal_code": code_postal,
-                    "city": ville,
-                    "country": {
-                        "code": pays_code
-                    },
-                    "is_invoicing_address": True,
-                    "is_delivery_address": True,
-                    "is_main": True
-                }
+                "is_invoicing_address": True,
+                "is_delivery_address": True,
+                "is_main": True
             }
-            
-            # Ajouter le téléphone seulement s'il est présent
-            if telephone:
-                client_data["third"]["tel"] = telephone
-                client_data["contact"]["tel"] = telephone
-            
-            # Ajout du champ installateur si présent
-            if installateur:
-                client_data["third"]["installateur"] = installateur
-
-            # Ajout du champ puissance en kWc si présent
-            if puissance_kwc:
-                client_data["third"]["puissance_en_kwc"] = puissance_kwc
-
-            # Ajout de la référence si présente
-            if contrat_abonne:
-                client_data["third"]["contrat_abonne"] = contrat_abonne
-            
-            logger.info(f"✅ Données client validées pour {prenom} {nom}")
+        }
+        
+        if nom_entreprise:
+            logger.info(f"✅ Données entreprise validées pour {libelle}")
+        else:
+            logger.info(f"✅ Données client validées pour {libelle}")
         
         return client_data
 
-    def synchronize_client(self, record: Dict):
+    def synchronize_client(self, record: Dict) -> Optional[str]:
         """
         Synchronise un client d'Airtable vers Sellsy.
         
         Args:
             record: Enregistrement Airtable à synchroniser
+            
+        Returns:
+            ID du client créé dans Sellsy, ou None si aucun client n'a été créé
         """
         record_fields = record.get('fields', {})
         record_id = record.get('id', 'inconnu')
         
         logger.info(f"🔄 Début de synchronisation pour l'enregistrement : {record_id}")
 
-        # Réinitialiser le résultat de synchronisation
-        self.sync_result = None
+        # Enregistrement déjà synchronisé : aucun appel Sellsy nécessaire
+        id_value = str(record_fields.get(self.sellsy_id_field, "")).strip()
+        if id_value and id_value.lower() != "none":
+            logger.debug("Synchronisation ignorée pour %s - déjà synchronisé (ID Sellsy: %s)", record_id, id_value)
+            return None
+
+        # Client déjà créé lors d'une exécution interrompue : seul l'ID reste à reporter dans Airtable
+        cached_id = self.sync_cache.get(record_id)
+        if cached_id:
+            logger.info(f"♻️ Client déjà créé dans Sellsy pour {record_id} (ID: {cached_id}), création ignorée")
+            return cached_id
 
         # Vérification du champ formule "Tag contrat signé"
         tag_contrat = str(record_fields.get("Tag contrat signé", "")).strip()
         if tag_contrat.lower() != "contrat signé":
             logger.info(f"⏩ Synchronisation ignorée pour {record_id} - Tag contrat signé = '{tag_contrat}'")
-            return
+            return None
 
         # Préparation et validation des données
         formatted_data = self.sanitize_client_data(record_fields)
         
         if not formatted_data:
             logger.warning(f"⏩ Synchronisation ignorée pour {record_id} - données insuffisantes")
-            return
+            return None
+        
+        # Client déjà présent dans Sellsy avec le même email : seul l'ID est reporté dans Airtable
+        if self.existing_clients:
+            # Un particulier n'est rattaché qu'à un particulier, une entreprise qu'à une entreprise
+            client_type = "individual" if formatted_data["third"]["type"] == "person" else "company"
+            existing_id = self.existing_clients.get((client_type, formatted_data["third"]["email"].lower()))
+            if existing_id:
+                logger.info(f"♻️ Client existant dans Sellsy pour {record_id} (ID: {existing_id}), création ignorée")
+                self.sync_cache.set(record_id, existing_id)
+                return existing_id
         
         try:
-            # Déterminer si le client est un individu ou une entreprise
-            is_individual = formatted_data["third"]["type"] == "person"
-            
-            # Extraire les données d'adresse avant la création du client
-            address_data = formatted_data.get("address", {})
-            
-            # Création du client dans Sellsy
+            # Création du client dans Sellsy (l'adresse est créée dans la foulée par create_client)
             response = self.sellsy_api.create_client(formatted_data)
 
             if response and response.get("status") == "success":
@@ -335,18 +379,10 @@ class ClientSynchronizer:
                 
                 if client_id:
                     logger.info(f"✅ Client créé avec succès dans Sellsy. ID: {client_id}")
+                    self.sync_cache.set(record_id, str(client_id))
                     
-                    # Créer explicitement l'adresse pour tous les clients, qu'ils soient individus ou entreprises
-                    # (Cela résout le problème des adresses non synchronisées)
-                    address_result = self.create_address_for_client(client_id, address_data, is_individual)
-                    if address_result:
-                        logger.info(f"✅ Adresse créée avec succès pour le client ID: {client_id}")
-                    else:
-                        logger.warning(f"⚠️ Échec de création d'adresse pour le client ID: {client_id}")
-                    
-                    # Stocker le résultat pour le wrapper
-                    # Assurons-nous de stocker uniquement l'ID comme chaîne
-                    self.sync_result = {"id": str(client_id)}
+                    # Retourner uniquement l'ID comme chaîne
+                    return str(client_id)
                 else:
                     logger.error(f"❌ Impossible de trouver l'ID client dans la réponse: {response}")
             else:
@@ -356,40 +392,8 @@ class ClientSynchronizer:
         except Exception as e:
             logger.error(f"❌ Erreur lors de la synchronisation : {str(e)}")
             logger.exception("Détails de l'erreur:")
-    
-    def create_address_for_client(self, client_id: str, address_data: Dict, is_individual: bool) -> bool:
-        """
-        Crée une adresse pour un client dans Sellsy.
         
-        Args:
-            client_id: ID du client dans Sellsy
-            address_data: Données de l'adresse
-            is_individual: True si le client est un particulier, False sinon
-            
-        Returns:
-            True si la création a réussi, False sinon
-        """
-        try:
-            # Formater l'adresse pour l'API Sellsy v2
-            formatted_address = {
-                "name": address_data.get("name", "Adresse principale"),
-                "address_line_1": address_data.get("address_line_1", ""),
-                "address_line_2": address_data.get("address_line_2", ""),
-                "postal_code": address_data.get("postal_code", ""),
-                "city": address_data.get("city", ""),
-                "country_code": address_data.get("country", {}).get("code", "FR") if isinstance(address_data.get("country", {}), dict) else address_data.get("country", "FR")
-            }
-            
-            logger.debug(f"Création d'adresse pour client {client_id}: {formatted_address}")
-            
-            # Créer l'adresse via l'API Sellsy
-            result = self.sellsy_api.create_address(client_id, formatted_address, is_individual)
-            
-            return result is not None
-            
-        except Exception as e:
-            logger.error(f"❌ Erreur lors de la création de l'adresse: {str(e)}")
-            return False
+        return None
 
 def check_configuration() -> bool:
     """
@@ -417,9 +421,9 @@ def check_configuration() -> bool:
         
     # Afficher les premières lettres des tokens pour le débogage (sans révéler les secrets)
     if Config.SELLSY_CLIENT_ID:
-        logger.debug(f"SELLSY_CLIENT_ID: {Config.SELLSY_CLIENT_ID[:3]}...")
+        logger.debug("SELLSY_CLIENT_ID: %s...", Config.SELLSY_CLIENT_ID[:3])
     if Config.SELLSY_CLIENT_SECRET:
-        logger.debug(f"SELLSY_CLIENT_SECRET: {Config.SELLSY_CLIENT_SECRET[:3]}...")
+        logger.debug("SELLSY_CLIENT_SECRET: %s...", Config.SELLSY_CLIENT_SECRET[:3])
     
     return True
 
@@ -443,7 +447,7 @@ def identify_sellsy_id_field(sample_records: List[Dict]) -> str:
         return "ID_Sellsy"
     
     sample_fields = sample_records[0].get('fields', {})
-    logger.debug(f"Champs disponibles dans Airtable: {list(sample_fields.keys())}")
+    logger.debug("Champs disponibles dans Airtable: %s", list(sample_fields))
     
     # Vérification des champs possibles
     for field in possible_id_fields:
@@ -454,6 +458,21 @@ def identify_sellsy_id_field(sample_records: List[Dict]) -> str:
     logger.warning("⚠️ Impossible de déterminer le champ ID Sellsy. Utilisation par défaut: 'ID_Sellsy'")
     return "ID_Sellsy"
 
+def build_unsynced_filter_formula(sellsy_id_field: str) -> str:
+    """
+    Construit la formule Airtable sélectionnant les enregistrements sans ID Sellsy.
+    
+    Un ID vide, composé d'espaces ou valant "None" est considéré comme absent.
+    
+    Args:
+        sellsy_id_field: Nom du champ stockant l'ID Sellsy
+    
+    Returns:
+        Formule utilisable dans le paramètre filterByFormula
+    """
+    id_value = f'LOWER(TRIM({{{sellsy_id_field}}}&""))'
+    return f'OR({id_value}="", {id_value}="none")'
+
 def main():
     """Fonction principale de synchronisation."""
     logger.info("🚀 Démarrage de la synchronisation des clients")
@@ -465,6 +484,7 @@ def main():
             logger.error("❌ Configuration incomplète. Arrêt du processus.")
             return
         
+        synchronizer = None
         try:    
             # Initialisation du synchroniseur
             synchronizer = ClientSynchronizer()
@@ -472,75 +492,93 @@ def main():
             # Récupération d'un échantillon pour identifier le champ ID Sellsy
             sample_records = synchronizer.airtable_api.get_records(None, 1)
             sellsy_id_field = identify_sellsy_id_field(sample_records)
+            synchronizer.sellsy_id_field = sellsy_id_field
             
-            # Récupération de tous les enregistrements
-            logger.info(f"🔍 Récupération de tous les enregistrements pour filtrage local")
-            all_records = synchronizer.airtable_api.get_records()
-            logger.info(f"📊 Nombre total d'enregistrements dans Airtable: {len(all_records)}")
+            # Index des clients Sellsy existants, pour ne pas créer de doublons
+            if Config.SELLSY_MATCH_BY_EMAIL:
+                synchronizer.load_existing_clients()
             
-            # Filtrage des enregistrements sans ID Sellsy
-            records_to_sync = []
-            for record in all_records:
-                fields = record.get('fields', {})
-                
-                # Vérifier si le champ existe et n'est pas vide
-                if sellsy_id_field not in fields or not fields.get(sellsy_id_field):
-                    records_to_sync.append(record)
-                    continue
-                
-                # Vérifier si le champ contient une valeur vide, des espaces ou "None"
-                id_value = str(fields.get(sellsy_id_field, "")).strip()
-                if id_value == "" or id_value.lower() == "none":
-                    records_to_sync.append(record)
-                    # Log pour débug
-                    logger.debug(f"Enregistrement sans ID valide trouvé: {record['id']} - Valeur: '{id_value}'")
-            
-            logger.info(f"📝 Nombre d'enregistrements à synchroniser: {len(records_to_sync)}")
-            
-            # Affichage des premiers enregistrements pour débogage
-            if records_to_sync and len(records_to_sync) > 0:
-                for idx, record in enumerate(records_to_sync[:3]):  # Afficher les 3 premiers pour le debug
-                    logger.debug(f"Enregistrement #{idx+1} à synchroniser: {json.dumps({k: v for k, v in record.get('fields', {}).items() if k in ['Nom', 'Prenom', 'Email']})}")
-                
-                # Création d'un wrapper pour la synchronisation qui utilise le bon champ
-                def sync_client_wrapper(record):
-                    try:
-                        # Synchronisation du client avec Sellsy
-                        synchronizer.synchronize_client(record)
-                        
-                        # Si la synchronisation réussit, mettre à jour le champ ID Sellsy
-                        if hasattr(synchronizer, 'sync_result') and synchronizer.sync_result:
-                            # Extraction de l'ID client comme chaîne simple
-                            client_id = str(synchronizer.sync_result.get('id'))
-                            if client_id:
-                                # Mise à jour du champ ID Sellsy dans Airtable avec une simple chaîne
-                                update_result = synchronizer.airtable_api.update_record(
-                                    record['id'], 
-                                    {sellsy_id_field: client_id}
-                                )
-                                
-                                if update_result:
-                                    logger.info(f"✅ ID Sellsy {client_id} mis à jour dans Airtable (champ: {sellsy_id_field})")
-                                else:
-                                    logger.error(f"❌ Échec de la mise à jour de l'ID Sellsy dans Airtable")
-                    except Exception as e:
-                        logger.error(f"❌ Erreur dans le wrapper de synchronisation: {str(e)}")
-                
-                # Si aucun enregistrement à synchroniser, terminer
-                if not records_to_sync:
-                    logger.info("⏹️ Aucun client sans ID Sellsy à synchroniser.")
-                    return
-                
-                logger.info(f"🔄 Synchronisation de {len(records_to_sync)} clients")
-                
-                # Synchronisation de chaque client
-                for i, record in enumerate(records_to_sync):
-                    logger.info(f"Client {i+1}/{len(records_to_sync)}")
-                    sync_client_wrapper(record)
-                    # Pause légère entre les requêtes pour respecter les limites d'API
-                    time.sleep(1)
+            # Mises à jour Airtable en attente, envoyées par lots de 10.
+            # Les lots partent en arrière-plan : la création Sellsy suivante
+            # n'attend pas la fin de l'écriture Airtable.
+            pending_updates = []
+            pending_lock = threading.Lock()
+            update_executor = ThreadPoolExecutor(max_workers=1)
+            update_futures = []
+
+            def send_updates(batch):
+                updated = synchronizer.airtable_api.update_records(batch)
+                # ID reporté dans Airtable : l'entrée de reprise n'est plus utile
+                synchronizer.sync_cache.delete(record["id"] for record in updated)
+                if len(updated) == len(batch):
+                    logger.info(f"✅ {len(updated)} ID Sellsy mis à jour dans Airtable (champ: {sellsy_id_field})")
+                else:
+                    logger.error(f"❌ Échec de la mise à jour de {len(batch) - len(updated)} ID Sellsy dans Airtable")
+
+            def flush_pending_updates():
+                with pending_lock:
+                    if not pending_updates:
+                        return
+                    batch = pending_updates[:]
+                    pending_updates.clear()
+                update_futures.append(update_executor.submit(send_updates, batch))
+
+            # Création d'un wrapper pour la synchronisation qui utilise le bon champ
+            def sync_client_wrapper(record):
+                try:
+                    # Synchronisation du client avec Sellsy
+                    client_id = synchronizer.synchronize_client(record)
+
+                    # Si la synchronisation réussit, programmer la mise à jour du champ ID Sellsy
+                    if client_id:
+                        with pending_lock:
+                            pending_updates.append({"id": record['id'], "fields": {sellsy_id_field: client_id}})
+                            batch_full = len(pending_updates) >= synchronizer.airtable_api.BATCH_SIZE
+                        if batch_full:
+                            flush_pending_updates()
+                except Exception as e:
+                    logger.error(f"❌ Erreur dans le wrapper de synchronisation: {str(e)}")
+
+            # Synchronisation des clients en parallèle. Le nombre d'enregistrements
+            # en attente est borné pour conserver le traitement au fil de l'eau.
+            sync_executor = ThreadPoolExecutor(max_workers=Config.SYNC_MAX_WORKERS)
+            synced_count = 0
+            try:
+                # Récupération des seuls enregistrements sans ID Sellsy (filtrage côté Airtable).
+                # Les pages sont traitées au fil de l'eau : la synchronisation commence
+                # dès la première page pendant que les suivantes sont téléchargées.
+                logger.info(f"🔍 Récupération des enregistrements sans ID Sellsy")
+                records_to_sync = synchronizer.airtable_api.iter_records(
+                    build_unsynced_filter_formula(sellsy_id_field)
+                )
+
+                in_flight = set()
+                for record in records_to_sync:
+                    synced_count += 1
+
+                    # Affichage des premiers enregistrements pour débogage
+                    if synced_count <= 3 and logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Enregistrement #%d à synchroniser: %s", synced_count, orjson.dumps({k: v for k, v in record.get('fields', {}).items() if k in ['Nom', 'Prenom', 'Email']}).decode())
+
+                    logger.info(f"Client {synced_count}")
+                    in_flight.add(sync_executor.submit(sync_client_wrapper, record))
+                    if len(in_flight) >= Config.SYNC_MAX_WORKERS * 2:
+                        _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            finally:
+                # Même en cas d'erreur, les clients déjà créés dans Sellsy
+                # voient leur ID reporté dans Airtable
+                sync_executor.shutdown(wait=True)
+                flush_pending_updates()
+                for future in update_futures:
+                    error = future.exception()
+                    if error:
+                        logger.error(f"❌ Erreur lors de l'envoi d'un lot de mises à jour Airtable: {str(error)}")
+                update_executor.shutdown(wait=True)
+
+            if synced_count:
+                logger.info(f"📝 Nombre d'enregistrements traités: {synced_count}")
             else:
-                logger.info("⏹️ Aucun client à synchroniser")
+                logger.info("⏹️ Aucun client sans ID Sellsy à synchroniser.")
                 
         except (ValueError, ConnectionError) as e:
             logger.error(f"❌ Erreur critique: {str(e)}")
@@ -551,6 +589,11 @@ def main():
             logger.exception("Détails de l'erreur:")
             return
         
+        finally:
+            # Connexions HTTP et cache SQLite libérés sur tous les chemins
+            if synchronizer is not None:
+                synchronizer.close()
+        
         end_time = time.time()
         logger.info(f"✅ Synchronisation terminée en {end_time - start_time:.2f} secondes")
     
@@ -1,9 +1,17 @@
-import os
-import json
 import time
+import base64
+import hashlib
+import orjson
 import requests
 import logging
-from typing import Dict, List, Optional
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from http_retry import build_retry_policy
+from urllib.parse import urlsplit
+from typing import Dict, Iterator, Optional
 from datetime import datetime, timedelta
 
 class SellsyAPI:
@@ -15,8 +23,41 @@ class SellsyAPI:
     API_BASE_URL = "https://api.sellsy.com/v2"
     # URL correcte pour l'authentification OAuth2 de Sellsy v2
     AUTH_URL = "https://login.sellsy.com/oauth2/access-tokens"
+    # Connexions conservées ouvertes vers l'API (au moins une par thread de synchronisation)
+    POOL_SIZE = 10
+    # Le serveur d'authentification ne reçoit qu'une requête à la fois (renouvellement unique)
+    AUTH_POOL_SIZE = 2
+    # Nouvelles tentatives sur les erreurs temporaires (connexion, limitation de débit, erreurs serveur)
+    MAX_RETRIES = 3
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    MAX_RETRY_WAIT = 30
     
-    def __init__(self, client_id, client_secret, access_token=None, refresh_token=None, logger=None):
+    # Renouvellement anticipé du token (secondes avant expiration), en arrière-plan,
+    # limité à une fraction de la durée de validité pour les tokens de courte durée
+    TOKEN_PREFETCH_WINDOW = 120
+    TOKEN_PREFETCH_FRACTION = 0.25
+    # Délai avant une nouvelle tentative de renouvellement anticipé (secondes)
+    TOKEN_PREFETCH_RETRY_DELAY = 30
+    
+    # Pages de résultats téléchargées en parallèle lorsque le total est connu
+    PAGE_WORKERS = 4
+    
+    # Tokens partagés entre les instances du processus, par empreinte du client_id
+    _shared_tokens = {}
+    _shared_tokens_lock = threading.Lock()
+    
+    # Durée de conservation (secondes) et taille maximale du cache des lectures client
+    CLIENT_CACHE_TTL = 60
+    CLIENT_CACHE_SIZE = 1024
+    
+    # Correspondance (champ v2, champ v1) selon le type de client
+    INDIVIDUAL_FIELDS = (("firstname", "firstname"), ("last_name", "name"), ("email", "email"), ("mobile", "tel"))
+    COMPANY_FIELDS = (("name", "name"), ("email", "email"))
+    # Champs personnalisés Sellsy (champ v1, slug v2)
+    CUSTOM_FIELDS = (("installateur", "installateur"), ("puissance_en_kwc", "puissance-en-kwc"))
+    
+    def __init__(self, client_id, client_secret, access_token=None, refresh_token=None, logger=None,
+                 connect_timeout=3.05, read_timeout=30, token_cache=None):
         """
         Initialise le client API Sellsy v2.
         
@@ -26,12 +67,47 @@ class SellsyAPI:
             access_token: Token d'accès (optionnel)
             refresh_token: Token de rafraîchissement (optionnel)
             logger: Logger pour journaliser les actions
+            connect_timeout: Délai maximal d'établissement de la connexion (secondes)
+            read_timeout: Délai maximal d'attente de la réponse (secondes)
+            token_cache: Cache du token partagé entre les exécutions (optionnel)
         """
         self.client_id = client_id
         self.client_secret = client_secret
+        
+        # Session partagée : les connexions TCP/TLS sont réutilisées entre les requêtes
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        })
+        # Un pool dimensionné pour chaque hôte : API et serveur d'authentification
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.POOL_SIZE,
+            max_retries=self._retry_policy()
+        ))
+        auth_url = urlsplit(self.AUTH_URL)
+        self.session.mount(f"{auth_url.scheme}://{auth_url.netloc}/", HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.AUTH_POOL_SIZE,
+            max_retries=self._retry_policy()
+        ))
+        
         self.access_token = access_token
         self.refresh_token = refresh_token
         self.token_expires_at = None
+        # Échéance du token en temps monotone (insensible aux changements d'horloge)
+        self._token_expires_monotonic = 0.0
+        # Instant (monotone) à partir duquel le token est renouvelé en arrière-plan
+        self._token_prefetch_at = 0.0
+        self.timeout = (connect_timeout, read_timeout)
+        self.token_cache = token_cache
+        # Un seul renouvellement du token à la fois, même avec plusieurs threads
+        self._token_lock = threading.Lock()
+        
+        # Cache des lectures client : clé -> (échéance monotone, réponse)
+        self._client_cache = {}
+        self._client_cache_lock = threading.Lock()
         
         # Définir un logger par défaut si aucun n'est fourni
         if logger is None:
@@ -44,19 +120,84 @@ class SellsyAPI:
         else:
             self.logger = logger
         
+        # Réutilisation d'un token encore valide : d'abord celui d'une autre instance
+        # du processus, sinon celui d'une exécution précédente
+        if not self.access_token:
+            with self._shared_tokens_lock:
+                cached = self._shared_tokens.get(self._client_key())
+            if not self._restore_token(cached) and self.token_cache:
+                if self._restore_token(self.token_cache.load(self.client_id)):
+                    self.logger.info("♻️ Token d'accès réutilisé depuis le cache")
+        
         self.logger.debug("SellsyAPI v2 initialisée avec succès")
     
-    def _get_auth_header(self) -> Dict:
+    def _retry_policy(self) -> Retry:
+        """Politique de nouvelles tentatives des sessions Sellsy (API et authentification)."""
+        return build_retry_policy(self.MAX_RETRIES, self.RETRY_STATUS_CODES, self.MAX_RETRY_WAIT,
+                                  allowed_methods=("GET", "POST", "PUT", "PATCH", "DELETE"))
+    
+    def close(self):
+        """Ferme la session HTTP et libère les connexions du pool."""
+        self.session.close()
+    
+    @property
+    def access_token(self) -> Optional[str]:
+        """Token d'accès courant."""
+        return self._access_token
+    
+    @access_token.setter
+    def access_token(self, value: Optional[str]):
+        # L'en-tête d'authentification de la session suit le token courant
+        self._access_token = value
+        if value:
+            self.session.headers["Authorization"] = f"Bearer {value}"
+        else:
+            self.session.headers.pop("Authorization", None)
+    
+    def _cache_get(self, key: tuple) -> Optional[Dict]:
         """
-        Obtient l'en-tête d'authentification pour les requêtes API.
+        Lit une réponse du cache des lectures client si elle n'a pas expiré.
         
+        Args:
+            key: Clé de cache (type de lecture, ID client, particulier ou non)
+            
         Returns:
-            En-tête d'authentification
+            Réponse mise en cache ou None
         """
-        if self._is_token_expired():
-            self.refresh_access_token()
-            
-        return {"Authorization": f"Bearer {self.access_token}"}
+        with self._client_cache_lock:
+            entry = self._client_cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._client_cache[key]
+                return None
+            return entry[1]
+    
+    def _cache_set(self, key: tuple, value: Dict):
+        """
+        Met en cache une réponse de lecture client.
+        
+        Args:
+            key: Clé de cache (type de lecture, ID client, particulier ou non)
+            value: Réponse de l'API
+        """
+        with self._client_cache_lock:
+            # Éviction de l'entrée la plus ancienne une fois la taille maximale atteinte
+            if len(self._client_cache) >= self.CLIENT_CACHE_SIZE:
+                del self._client_cache[next(iter(self._client_cache))]
+            self._client_cache[key] = (time.monotonic() + self.CLIENT_CACHE_TTL, value)
+    
+    def invalidate_client(self, client_id: str):
+        """
+        Retire du cache toutes les lectures concernant un client.
+        
+        Args:
+            client_id: ID du client modifié
+        """
+        client_id = str(client_id)
+        with self._client_cache_lock:
+            for key in [k for k in self._client_cache if k[1] == client_id]:
+                del self._client_cache[key]
     
     def _is_token_expired(self) -> bool:
         """
@@ -65,67 +206,177 @@ class SellsyAPI:
         Returns:
             True si le token est expiré ou non défini, False sinon
         """
-        if not self.access_token or not self.token_expires_at:
-            return True
-            
-        return datetime.now() >= self.token_expires_at
+        return not self.access_token or time.monotonic() >= self._token_expires_monotonic
     
-    def get_access_token(self) -> bool:
+    @staticmethod
+    def _token_lifetime(token: str, expires_in: float) -> float:
         """
-        Obtient un nouveau token d'accès en utilisant le flux d'authentification client credentials.
+        Détermine la durée de validité d'un token d'accès.
+        
+        Si le token est un JWT, sa revendication "exp" fait foi ; sinon la
+        durée expires_in annoncée par le serveur est utilisée.
         
+        Args:
+            token: Token d'accès
+            expires_in: Durée de validité annoncée par le serveur (secondes)
+            
         Returns:
-            True si l'obtention du token a réussi, False sinon
+            Durée de validité restante (secondes)
         """
         try:
-            self.logger.info("🔄 Obtention d'un nouveau token d'accès...")
+            payload = token.split(".")[1]
+            claims = orjson.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+            return float(claims["exp"]) - time.time()
+        except (IndexError, KeyError, TypeError, ValueError, orjson.JSONDecodeError):
+            # Token opaque : pas de date d'expiration lisible
+            return expires_in
+    
+    def _set_token_expiry(self, expires_in: float):
+        """
+        Enregistre l'échéance du token d'accès courant.
+        
+        Args:
+            expires_in: Durée de validité restante du token (secondes, marge de sécurité déduite)
+        """
+        now = time.monotonic()
+        self._token_expires_monotonic = now + expires_in
+        self._token_prefetch_at = self._token_expires_monotonic - min(
+            self.TOKEN_PREFETCH_WINDOW, expires_in * self.TOKEN_PREFETCH_FRACTION
+        )
+        # Date absolue conservée pour les journaux et le cache sur disque
+        self.token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+    
+    def _client_key(self) -> str:
+        """Empreinte du client_id servant de clé au cache partagé (évite de conserver l'identifiant en clair)."""
+        return hashlib.sha256(self.client_id.encode()).hexdigest()
+    
+    def _restore_token(self, cached: Optional[Dict]) -> bool:
+        """
+        Reprend un token mis en cache s'il est encore valide.
+        
+        Args:
+            cached: Dictionnaire {access_token, refresh_token, expires_at} ou None
             
-            # Préparation du payload pour la requête
-            payload = {
-                "grant_type": "client_credentials",
-                "client_id": self.client_id,
-                "client_secret": self.client_secret
+        Returns:
+            True si le token a été repris, False sinon
+        """
+        if not cached or cached["expires_at"] <= datetime.now():
+            return False
+        self.access_token = cached["access_token"]
+        self.refresh_token = self.refresh_token or cached["refresh_token"]
+        self._set_token_expiry((cached["expires_at"] - datetime.now()).total_seconds())
+        return True
+    
+    def _save_token(self):
+        """Partage le token courant avec les autres instances et l'enregistre dans le cache s'il est configuré."""
+        with self._shared_tokens_lock:
+            self._shared_tokens[self._client_key()] = {
+                "access_token": self.access_token,
+                "refresh_token": self.refresh_token,
+                "expires_at": self.token_expires_at
             }
+        if self.token_cache:
+            self.token_cache.save(self.client_id, self.access_token, self.refresh_token, self.token_expires_at)
+    
+    def _ensure_token(self) -> bool:
+        """
+        S'assure qu'un token d'accès valide est disponible.
+        
+        Le token n'est renouvelé que s'il est absent ou expiré.
+        
+        Returns:
+            True si un token valide est disponible, False sinon
+        """
+        # Vérification sans verrou dans le cas courant d'un token valide
+        if not self._is_token_expired():
+            if time.monotonic() >= self._token_prefetch_at:
+                self._prefetch_token()
+            return True
+        
+        with self._token_lock:
+            # Un autre thread a pu renouveler le token pendant l'attente du verrou
+            if not self._is_token_expired():
+                return True
+            return self.get_access_token()
+    
+    def _prefetch_token(self):
+        """
+        Renouvelle en arrière-plan un token proche de l'expiration.
+        
+        Les requêtes continuent avec le token courant, encore valide, au lieu
+        d'attendre le renouvellement à son expiration.
+        """
+        # Renouvellement déjà en cours : rien à faire
+        if not self._token_lock.acquire(blocking=False):
+            return
+        
+        # Token renouvelé entre-temps par un autre thread, ou tentative récente
+        if time.monotonic() < self._token_prefetch_at:
+            self._token_lock.release()
+            return
+        
+        # Pas de nouvelle tentative avant ce délai si le renouvellement échoue ;
+        # un renouvellement réussi recalcule l'échéance avec le nouveau token
+        self._token_prefetch_at = time.monotonic() + self.TOKEN_PREFETCH_RETRY_DELAY
+        
+        def renew():
+            try:
+                self.logger.debug("Renouvellement anticipé du token d'accès")
+                self.refresh_access_token()
+            finally:
+                self._token_lock.release()
+        
+        try:
+            threading.Thread(target=renew, daemon=True).start()
+        except RuntimeError:
+            self._token_lock.release()
+    
+    def _renew_rejected_token(self, rejected_token: Optional[str]) -> bool:
+        """
+        Renouvelle un token refusé par l'API (401).
+        
+        Si plusieurs threads reçoivent un 401 pour le même token, un seul
+        renouvellement est effectué ; les autres réutilisent le nouveau token.
+        
+        Args:
+            rejected_token: Token envoyé avec la requête refusée
             
-            # En-têtes pour spécifier le type de contenu
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
+        Returns:
+            True si un nouveau token est disponible, False sinon
+        """
+        with self._token_lock:
+            if self.access_token and self.access_token != rejected_token:
+                return True
+            return self.refresh_access_token()
+    
+    def _post_token(self, payload: Dict) -> Optional[float]:
+        """
+        Envoie une requête au serveur d'authentification et enregistre le token obtenu.
+        
+        Args:
+            payload: Paramètres OAuth 2.0 (grant_type et identifiants)
             
-            # Debug pour voir ce qui est envoyé
-            self.logger.debug(f"Envoi de requête d'authentification à {self.AUTH_URL}")
-            self.logger.debug(f"Payload: {payload}")
+        Returns:
+            Durée de validité du token en secondes, ou None en cas d'échec
+        """
+        try:
+            self.logger.debug("Envoi de requête d'authentification à %s", self.AUTH_URL)
             
-            # Requête avec gestion explicite des timeouts et vérification SSL
-            response = requests.post(
+            # Le token d'accès courant n'est pas envoyé au serveur d'authentification
+            response = self.session.post(
                 self.AUTH_URL, 
-                json=payload,
-                headers=headers,
-                timeout=30,
+                data=orjson.dumps(payload),
+                headers={"Authorization": None},
+                timeout=self.timeout,
                 verify=True
             )
             
             # Log de la réponse brute pour diagnostiquer les problèmes
-            self.logger.debug(f"Code de statut de réponse: {response.status_code}")
-            self.logger.debug(f"Réponse brute: {response.text[:200]}")
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    self.access_token = data["access_token"]
-                    # Le refresh token n'est pas fourni avec client_credentials
-                    # Calcul de la date d'expiration
-                    expires_in = data.get("expires_in", 3600)
-                    self.token_expires_at = datetime.now() + timedelta(seconds=expires_in - 60)  # -60 pour marge de sécurité
-                    
-                    self.logger.info(f"✅ Token d'accès obtenu avec succès (expire dans {expires_in} secondes)")
-                    return True
-                except json.JSONDecodeError as json_err:
-                    self.logger.error(f"❌ Impossible de décoder la réponse JSON: {json_err}")
-                    self.logger.error(f"Contenu de la réponse: {response.text}")
-                    return False
-            else:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Code de statut de réponse: %s", response.status_code)
+                self.logger.debug("Réponse brute: %s", response.content[:200].decode("utf-8", "replace"))
+            
+            if response.status_code != 200:
                 self.logger.error(f"❌ Échec d'obtention du token: {response.status_code}")
                 self.logger.error(f"Détails: {response.text}")
                 
@@ -135,17 +386,54 @@ class SellsyAPI:
                 elif response.status_code == 400:
                     self.logger.error("❌ Requête incorrecte. Vérifiez le format des paramètres.")
                 
-                return False
-                
+                return None
+            
+            try:
+                data = orjson.loads(response.content)
+            except orjson.JSONDecodeError as json_err:
+                self.logger.error(f"❌ Impossible de décoder la réponse JSON: {json_err}")
+                self.logger.error(f"Contenu de la réponse: {response.text}")
+                return None
+            
+            self.access_token = data["access_token"]
+            # Le refresh token n'est pas fourni avec client_credentials
+            if "refresh_token" in data:
+                self.refresh_token = data["refresh_token"]
+            # Calcul de la date d'expiration
+            expires_in = self._token_lifetime(self.access_token, data.get("expires_in", 3600))
+            self._set_token_expiry(expires_in - 60)  # -60 pour marge de sécurité
+            self._save_token()
+            return expires_in
+            
         except requests.exceptions.Timeout:
             self.logger.error("❌ Timeout lors de la connexion à l'API Sellsy")
-            return False
+            return None
         except requests.exceptions.ConnectionError:
             self.logger.error("❌ Impossible de se connecter à l'API Sellsy - Vérifiez votre connexion internet")
-            return False
+            return None
         except Exception as e:
             self.logger.error(f"❌ Erreur lors de l'obtention du token: {str(e)}")
+            return None
+    
+    def get_access_token(self) -> bool:
+        """
+        Obtient un nouveau token d'accès en utilisant le flux d'authentification client credentials.
+        
+        Returns:
+            True si l'obtention du token a réussi, False sinon
+        """
+        self.logger.info("🔄 Obtention d'un nouveau token d'accès...")
+        
+        expires_in = self._post_token({
+            "grant_type": "client_credentials",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret
+        })
+        if expires_in is None:
             return False
+        
+        self.logger.info(f"✅ Token d'accès obtenu avec succès (expire dans {expires_in} secondes)")
+        return True
     
     def refresh_access_token(self) -> bool:
         """
@@ -154,54 +442,23 @@ class SellsyAPI:
         Returns:
             True si le rafraîchissement a réussi, False sinon
         """
-        if self.refresh_token:
-            try:
-                self.logger.info("🔄 Rafraîchissement du token d'accès...")
-                
-                payload = {
-                    "grant_type": "refresh_token",
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "refresh_token": self.refresh_token
-                }
-                
-                headers = {
-                    "Content-Type": "application/json",
-                    "Accept": "application/json"
-                }
-                
-                response = requests.post(
-                    self.AUTH_URL, 
-                    json=payload,
-                    headers=headers,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        self.access_token = data["access_token"]
-                        if "refresh_token" in data:
-                            self.refresh_token = data["refresh_token"]
-                        expires_in = data.get("expires_in", 3600)
-                        self.token_expires_at = datetime.now() + timedelta(seconds=expires_in - 60)
-                        
-                        self.logger.info(f"✅ Token d'accès rafraîchi avec succès")
-                        return True
-                    except json.JSONDecodeError:
-                        self.logger.error(f"❌ Impossible de décoder la réponse JSON: {response.text}")
-                        return False
-                else:
-                    self.logger.error(f"❌ Échec du rafraîchissement du token: {response.status_code}")
-                    self.logger.error(f"Détails: {response.text}")
-                    return False
-                    
-            except Exception as e:
-                self.logger.error(f"❌ Erreur lors du rafraîchissement du token: {str(e)}")
-                return False
-        else:
-            # Si pas de refresh_token, on utilise le flux client credentials
+        # Si pas de refresh_token, on utilise le flux client credentials
+        if not self.refresh_token:
             return self.get_access_token()
+        
+        self.logger.info("🔄 Rafraîchissement du token d'accès...")
+        
+        expires_in = self._post_token({
+            "grant_type": "refresh_token",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "refresh_token": self.refresh_token
+        })
+        if expires_in is None:
+            return False
+        
+        self.logger.info(f"✅ Token d'accès rafraîchi avec succès")
+        return True
     
     def request_api(self, method: str, endpoint: str, data: Dict = None, params: Dict = None) -> Optional[Dict]:
         """
@@ -218,75 +475,79 @@ class SellsyAPI:
         """
         max_retries = 3
         retry_count = 0
+        token_refreshed = False
+        
+        # URL et corps préparés une seule fois : une nouvelle tentative renvoie la même requête
+        url = f"{self.API_BASE_URL}/{endpoint.lstrip('/')}"
+        body = orjson.dumps(data) if data else None
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Requête API v2: %s %s", method, url)
+            if body:
+                self.logger.debug("Données: %s...", body[:200].decode("utf-8", "replace"))
+            if params:
+                self.logger.debug("Paramètres: %s", params)
         
         while retry_count < max_retries:
             try:
                 # S'assurer que nous avons un token valide
-                if self._is_token_expired():
-                    if not self.get_access_token():
-                        self.logger.error("❌ Impossible d'obtenir un token d'accès valide")
-                        return None
-                
-                # Préparation de l'URL
-                url = f"{self.API_BASE_URL}/{endpoint.lstrip('/')}"
-                
-                # Préparation des en-têtes
-                headers = {
-                    "Authorization": f"Bearer {self.access_token}",
-                    "Content-Type": "application/json",
-                    "Accept": "application/json"
-                }
+                if not self._ensure_token():
+                    self.logger.error("❌ Impossible d'obtenir un token d'accès valide")
+                    return None
                 
-                self.logger.debug(f"Requête API v2: {method} {url}")
-                if data:
-                    self.logger.debug(f"Données: {json.dumps(data)[:200]}...")
-                if params:
-                    self.logger.debug(f"Paramètres: {params}")
+                sent_token = self.access_token
                 
                 # Exécution de la requête avec timeout
-                response = requests.request(
+                response = self.session.request(
                     method=method,
                     url=url,
-                    headers=headers,
-                    json=data if data else None,
+                    data=body,
                     params=params if params else None,
-                    timeout=30
+                    timeout=self.timeout
                 )
                 
                 # Vérification du statut de la réponse
                 if response.status_code in [200, 201, 202, 204]:
                     try:
                         if response.content:
-                            result = response.json()
-                            self.logger.debug(f"Réponse reçue: {json.dumps(result)[:200]}...")
+                            result = orjson.loads(response.content)
+                            if self.logger.isEnabledFor(logging.DEBUG):
+                                self.logger.debug("Réponse reçue: %s...", response.content[:200].decode("utf-8", "replace"))
                             return result
                         return {"status": "success"}
-                    except json.JSONDecodeError:
-                        self.logger.error(f"❌ Réponse non-JSON: {response.text[:200]}")
+                    except orjson.JSONDecodeError:
+                        self.logger.error(f"❌ Réponse non-JSON: {response.content[:200].decode('utf-8', 'replace')}")
                         return None
                 elif response.status_code == 401:
+                    # Un 401 juste après un rafraîchissement vient des identifiants : inutile de boucler
+                    if token_refreshed:
+                        self.logger.error("❌ Accès refusé malgré un token rafraîchi")
+                        return None
+                    
                     # Token expiré ou invalide, on tente de rafraîchir
                     self.logger.warning("⚠️ Token d'accès expiré. Tentative de rafraîchissement...")
-                    if self.refresh_access_token():
+                    token_refreshed = True
+                    if self._renew_rejected_token(sent_token):
                         # On réessaie la requête avec le nouveau token lors de la prochaine itération
                         retry_count += 1
                         continue
                     return None
                 else:
+                    # Les erreurs temporaires (429, 5xx) ont déjà été rejouées par la session
                     self.logger.error(f"❌ Erreur HTTP: {response.status_code}")
                     self.logger.error(f"Détails: {response.text}")
-                    
-                    # Si c'est une erreur temporaire (429, 500, 502, 503, 504), on réessaie
-                    if response.status_code in [429, 500, 502, 503, 504]:
-                        retry_count += 1
-                        wait_time = 2 ** retry_count  # Backoff exponentiel
-                        self.logger.info(f"⏱️ Attente de {wait_time} secondes avant nouvelle tentative ({retry_count}/{max_retries})")
-                        time.sleep(wait_time)
-                        continue
-                    
                     return None
                 
+            except requests.exceptions.ConnectTimeout:
+                # Les échecs de connexion ont déjà été rejoués par la session
+                self.logger.error("❌ Timeout de connexion à l'API Sellsy après plusieurs tentatives")
+                return None
             except requests.exceptions.Timeout:
+                # Une création dont la réponse n'est pas arrivée a pu être enregistrée
+                # par Sellsy : la rejouer risquerait de créer un doublon
+                if method == "POST":
+                    self.logger.error("❌ Timeout en attente de la réponse à une création, requête non rejouée pour éviter un doublon")
+                    return None
                 self.logger.warning(f"⚠️ Timeout lors de la requête (tentative {retry_count+1}/{max_retries})")
                 retry_count += 1
                 if retry_count < max_retries:
@@ -317,12 +578,8 @@ class SellsyAPI:
         self.logger.info("🔄 Test d'authentification Sellsy v2...")
         
         try:
-            # Obtenons d'abord un token valide
-            if not self.get_access_token():
-                self.logger.error("❌ Impossible d'obtenir un token valide")
-                return False
-            
             # Test avec l'endpoint /companies selon la documentation
+            # (request_api obtient un token si aucun token valide n'est disponible)
             response = self.request_api("GET", "/companies", params={"pagination[limit]": 1})
             
             if response is not None:
@@ -367,7 +624,7 @@ class SellsyAPI:
                 endpoint = "/companies"
             
             # Exécution de la requête
-            self.logger.debug(f"Données client formatées pour v2: {v2_client_data}")
+            self.logger.debug("Données client formatées pour v2: %s", v2_client_data)
             response = self.request_api("POST", endpoint, v2_client_data)
             
             if response:
@@ -375,26 +632,34 @@ class SellsyAPI:
                 client_id = response.get("id")
                 self.logger.info(f"✅ Client créé avec succès! ID: {client_id}")
                 
-                # Créer l'adresse séparément si nécessaire
-                if client_id and address_data:
-                    address_result = self.create_address(client_id, address_data, is_individual)
-                    if address_result:
+                # L'adresse et les champs personnalisés sont indépendants :
+                # leurs requêtes partent en parallèle
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    address_future = None
+                    custom_fields_future = None
+                    if client_id and address_data:
+                        address_future = executor.submit(self.create_address, client_id, address_data, is_individual)
+                    if client_id and custom_fields_data:
+                        custom_fields_future = executor.submit(
+                            self.update_custom_fields, client_id, custom_fields_data, is_individual
+                        )
+                    
+                    # Créer le contact séparément pour les entreprises
+                    if client_id and contact_data and not is_individual:
+                        contact_result = self._create_client_contact(client_id, contact_data)
+                        if contact_result:
+                            self.logger.info(f"✅ Contact créé avec succès pour l'entreprise {client_id}")
+                        else:
+                            self.logger.warning(f"⚠️ Échec de création du contact pour l'entreprise {client_id}")
+                
+                if address_future:
+                    if address_future.result():
                         self.logger.info(f"✅ Adresse créée avec succès pour le client {client_id}")
                     else:
                         self.logger.warning(f"⚠️ Échec de création d'adresse pour le client {client_id}")
                 
-                # Créer le contact séparément pour les entreprises
-                if client_id and contact_data and not is_individual:
-                    contact_result = self._create_client_contact(client_id, contact_data)
-                    if contact_result:
-                        self.logger.info(f"✅ Contact créé avec succès pour l'entreprise {client_id}")
-                    else:
-                        self.logger.warning(f"⚠️ Échec de création du contact pour l'entreprise {client_id}")
-
-                # Mettre à jour les champs personnalisés si nécessaires
-                if client_id and custom_fields_data:
-                    custom_fields_result = self.update_custom_fields(client_id, custom_fields_data, is_individual)
-                    if custom_fields_result:
+                if custom_fields_future:
+                    if custom_fields_future.result():
                         self.logger.info(f"✅ Champs personnalisés mis à jour avec succès pour le client {client_id}")
                     else:
                         self.logger.warning(f"⚠️ Échec de mise à jour des champs personnalisés pour le client {client_id}")
@@ -425,43 +690,24 @@ class SellsyAPI:
         contact = old_data.get("contact", {})
         address = old_data.get("address", {})
         
-        # Formatage en fonction du type de client
+        # Formatage en fonction du type de client selon la doc API v2
         if is_individual:
-            # Format pour les particuliers selon la doc API v2
-            result = {
-                "firstname": contact.get("firstname", ""),
-                "last_name": contact.get("name", ""),
-                "email": contact.get("email", ""),
-                "mobile": contact.get("tel", ""),
-                "type": "client"
-            }
-            
-            # Ajout de la référence si présente
-            if "contrat_abonne" in third and third["contrat_abonne"]:
-                result["reference"] = third["contrat_abonne"]
+            result = {v2: contact.get(v1, "") for v2, v1 in self.INDIVIDUAL_FIELDS}
         else:
-            # Format pour les entreprises selon la doc API v2
-            result = {
-                "name": third.get("name", ""),
-                "email": third.get("email", ""),
-                "type": "client"
-            }
-
+            result = {v2: third.get(v1, "") for v2, v1 in self.COMPANY_FIELDS}
+            
             # SIRET si disponible
-            if "siret" in third and third["siret"]:
+            if third.get("siret"):
                 result["siret"] = third["siret"]
-
-            # Ajout de la référence si présente
-            if "contrat_abonne" in third and third["contrat_abonne"]:
-                result["reference"] = third["contrat_abonne"]
+        
+        result["type"] = "client"
+        
+        # Ajout de la référence si présente
+        if third.get("contrat_abonne"):
+            result["reference"] = third["contrat_abonne"]
 
         # Stocker les champs personnalisés séparément
-        custom_fields = {}
-        if "installateur" in third and third["installateur"]:
-            custom_fields["installateur"] = third["installateur"]
-        if "puissance_en_kwc" in third and third["puissance_en_kwc"]:
-            custom_fields["puissance-en-kwc"] = third["puissance_en_kwc"]
-
+        custom_fields = {slug: third[key] for key, slug in self.CUSTOM_FIELDS if third.get(key)}
         if custom_fields:
             result["_custom_fields"] = custom_fields
 
@@ -471,7 +717,7 @@ class SellsyAPI:
         if contact and not is_individual:
             result["_contact_data"] = contact
         
-        self.logger.debug(f"Données client formatées pour v2: {result}")
+        self.logger.debug("Données client formatées pour v2: %s", result)
         return result
     
     def _format_address_for_v2(self, address: Dict) -> Dict:
@@ -484,13 +730,18 @@ class SellsyAPI:
         Returns:
             Données d'adresse au format v2
         """
+        # Le pays peut être fourni sous forme de code ou d'objet {"code": ...}
+        country = address.get("country", "FR")
+        if isinstance(country, dict):
+            country = country.get("code", "FR")
+        
         return {
             "name": "Adresse principale",  # Nom descriptif de l'adresse
             "address_line_1": address.get("address_line_1", ""),
             "address_line_2": address.get("address_line_2", ""),
             "postal_code": address.get("postal_code", ""),
             "city": address.get("city", ""),
-            "country_code": address.get("country", {}).get("code", "FR") if isinstance(address.get("country", {}), dict) else address.get("country", "FR")
+            "country_code": country
         }
     
     def get_client(self, client_id: str, is_individual: bool = False) -> Optional[Dict]:
@@ -504,10 +755,20 @@ class SellsyAPI:
         Returns:
             Informations du client ou None en cas d'erreur
         """
+        cache_key = ("client", str(client_id), is_individual)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self.logger.debug("Client %s lu depuis le cache", client_id)
+            return cached
+        
         endpoint = f"/individuals/{client_id}" if is_individual else f"/companies/{client_id}"
         self.logger.info(f"🔄 Récupération du client ID: {client_id}")
         
-        return self.request_api("GET", endpoint)
+        # Les erreurs (None) ne sont pas mises en cache
+        result = self.request_api("GET", endpoint)
+        if result is not None:
+            self._cache_set(cache_key, result)
+        return result
     
     def update_client(self, client_id: str, client_data: Dict, is_individual: bool = False) -> Optional[Dict]:
         """
@@ -535,6 +796,7 @@ class SellsyAPI:
         
         # Exécuter la requête
         response = self.request_api("PUT", endpoint, v2_client_data)
+        self.invalidate_client(client_id)
         
         if response:
             self.logger.info(f"✅ Client mis à jour avec succès!")
@@ -587,9 +849,12 @@ class SellsyAPI:
         if type_filter:
             params["type"] = type_filter
         
-        # Recherche dans les entreprises et particuliers
-        companies = self.request_api("GET", "/companies", params=params) or {"data": []}
-        individuals = self.request_api("GET", "/individuals", params=params) or {"data": []}
+        # Recherche simultanée dans les entreprises et les particuliers (deux requêtes indépendantes)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            companies_future = executor.submit(self.request_api, "GET", "/companies", params=params)
+            individuals_future = executor.submit(self.request_api, "GET", "/individuals", params=params)
+            companies = companies_future.result() or {"data": []}
+            individuals = individuals_future.result() or {"data": []}
         
         # Combiner les résultats
         results = []
@@ -609,6 +874,72 @@ class SellsyAPI:
         
         return {"data": results, "total_count": len(results)}
     
+    def iter_clients(self, search_term: str = None, page_size: int = 100, type_filter: str = None) -> Iterator[Dict]:
+        """
+        Parcourt tous les clients Sellsy (entreprises puis particuliers), page par page.
+        
+        Lorsque Sellsy indique le nombre total de résultats, les pages suivantes
+        sont téléchargées en parallèle ; sinon la page suivante est téléchargée
+        en arrière-plan pendant que l'appelant traite la page courante.
+        
+        Args:
+            search_term: Terme de recherche (facultatif)
+            page_size: Nombre de clients demandés par page
+            type_filter: Filtrer par type (client, prospect, etc.)
+            
+        Yields:
+            Clients Sellsy, avec le champ client_type ("company" ou "individual")
+        """
+        def get_page(endpoint, offset):
+            params = {
+                "pagination[limit]": page_size,
+                "pagination[offset]": offset
+            }
+            if search_term:
+                params["search"] = search_term
+            if type_filter:
+                params["type"] = type_filter
+            return self.request_api("GET", endpoint, params=params)
+        
+        executor = ThreadPoolExecutor(max_workers=self.PAGE_WORKERS)
+        try:
+            for endpoint, client_type in (("/companies", "company"), ("/individuals", "individual")):
+                page = get_page(endpoint, 0)
+                if page is None:
+                    self.logger.warning(f"⚠️ Parcours de {endpoint} interrompu : première page indisponible")
+                total = page.get("pagination", {}).get("total") if page else None
+                next_offset = page_size
+                pending = deque()
+                count = 0
+                
+                while page:
+                    clients = page.get("data", [])
+                    
+                    if total is not None:
+                        # Total connu : plusieurs pages demandées à l'avance, dans l'ordre
+                        while len(pending) < self.PAGE_WORKERS and next_offset < total:
+                            pending.append(executor.submit(get_page, endpoint, next_offset))
+                            next_offset += page_size
+                    elif len(clients) == page_size and not pending:
+                        # Total inconnu : une page incomplète est la dernière
+                        pending.append(executor.submit(get_page, endpoint, next_offset))
+                        next_offset += page_size
+                    
+                    for client in clients:
+                        client["client_type"] = client_type
+                        yield client
+                    count += len(clients)
+                    
+                    if not pending:
+                        break
+                    page = pending.popleft().result()
+                    if page is None:
+                        # Résultats incomplets : l'appelant ne doit pas les croire exhaustifs
+                        self.logger.warning(f"⚠️ Parcours de {endpoint} interrompu : page indisponible "
+                                            f"après {count} clients")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def create_address(self, client_id: str, address_data: Dict, is_individual: bool = False) -> Optional[Dict]:
         """
         Crée une adresse pour un client existant.
@@ -628,7 +959,9 @@ class SellsyAPI:
         v2_address_data = self._format_address_for_v2(address_data)
         
         self.logger.info(f"🔄 Création d'une adresse pour le client ID: {client_id}")
-        return self.request_api("POST", endpoint, v2_address_data)
+        result = self.request_api("POST", endpoint, v2_address_data)
+        self.invalidate_client(client_id)
+        return result
     
     def get_client_addresses(self, client_id: str, is_individual: bool = False) -> Optional[Dict]:
         """
@@ -641,11 +974,22 @@ class SellsyAPI:
         Returns:
             Liste des adresses ou None en cas d'erreur
         """
+        cache_key = ("addresses", str(client_id), is_individual)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self.logger.debug("Adresses du client %s lues depuis le cache", client_id)
+            return cached
+        
         entity_type = "individuals" if is_individual else "companies"
         endpoint = f"/{entity_type}/{client_id}/addresses"
         
         self.logger.info(f"🔄 Récupération des adresses du client ID: {client_id}")
-        return self.request_api("GET", endpoint)
+        
+        # Les erreurs (None) ne sont pas mises en cache
+        result = self.request_api("GET", endpoint)
+        if result is not None:
+            self._cache_set(cache_key, result)
+        return result
     
     def update_custom_fields(self, client_id: str, custom_fields: Dict, is_individual: bool = False) -> Optional[Dict]:
         """
@@ -663,9 +1007,11 @@ class SellsyAPI:
         endpoint = f"/{entity_type}/{client_id}/custom-fields"
 
         self.logger.info(f"🔄 Mise à jour des champs personnalisés pour le client ID: {client_id}")
-        self.logger.debug(f"Champs personnalisés à envoyer: {custom_fields}")
+        self.logger.debug("Champs personnalisés à envoyer: %s", custom_fields)
 
-        return self.request_api("PUT", endpoint, custom_fields)
+        result = self.request_api("PUT", endpoint, custom_fields)
+        self.invalidate_client(client_id)
+        return result
 
     def _create_client_contact(self, client_id: str, contact_data: Dict) -> bool:
         """
@@ -0,0 +1,98 @@
+import sqlite3
+import logging
+import threading
+from typing import Iterable, Optional
+
+class SyncCache:
+    """
+    Cache local des clients déjà créés dans Sellsy (ID Airtable -> ID Sellsy).
+
+    Si une exécution est interrompue avant l'écriture de l'ID dans Airtable,
+    l'exécution suivante retrouve l'ID ici au lieu de recréer le client dans Sellsy.
+    """
+
+    def __init__(self, path: str):
+        """
+        Ouvre (ou crée) la base SQLite du cache.
+
+        Args:
+            path: Chemin du fichier SQLite
+        """
+        self.path = path
+        self.logger = logging.getLogger('SellsySynchronizer')
+        # La connexion est partagée entre les threads de synchronisation
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS synced (airtable_id TEXT PRIMARY KEY, sellsy_id TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, airtable_id: str) -> Optional[str]:
+        """
+        Recherche l'ID Sellsy associé à un enregistrement Airtable.
+
+        Args:
+            airtable_id: ID de l'enregistrement Airtable
+
+        Returns:
+            ID du client Sellsy ou None s'il n'est pas en cache
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT sellsy_id FROM synced WHERE airtable_id = ?", (airtable_id,)
+                ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            self.logger.error(f"❌ Erreur de lecture du cache de synchronisation: {str(e)}")
+            return None
+
+    def set(self, airtable_id: str, sellsy_id: str) -> bool:
+        """
+        Enregistre l'ID Sellsy créé pour un enregistrement Airtable.
+
+        Args:
+            airtable_id: ID de l'enregistrement Airtable
+            sellsy_id: ID du client créé dans Sellsy
+
+        Returns:
+            True si l'écriture a réussi, False sinon
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO synced (airtable_id, sellsy_id) VALUES (?, ?)",
+                    (airtable_id, sellsy_id)
+                )
+                self._conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"❌ Erreur d'écriture dans le cache de synchronisation: {str(e)}")
+            return False
+
+    def delete(self, airtable_ids: Iterable[str]) -> bool:
+        """
+        Retire du cache les enregistrements dont l'ID Sellsy est désormais dans Airtable.
+
+        Args:
+            airtable_ids: IDs des enregistrements Airtable mis à jour
+
+        Returns:
+            True si la suppression a réussi, False sinon
+        """
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "DELETE FROM synced WHERE airtable_id = ?", [(airtable_id,) for airtable_id in airtable_ids]
+                )
+                self._conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"❌ Erreur de suppression dans le cache de synchronisation: {str(e)}")
+            return False
+
+    def close(self):
+        """Ferme la connexion SQLite."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,98 @@
+import os
+import orjson
+import logging
+import tempfile
+from typing import Dict, Optional
+from datetime import datetime
+
+class TokenCache:
+    """
+    Cache sur disque du token d'accès Sellsy.
+
+    Permet à une nouvelle exécution de réutiliser un token encore valide au lieu
+    de refaire un échange OAuth au démarrage.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialise le cache.
+
+        Args:
+            path: Chemin du fichier JSON du cache
+        """
+        self.path = path
+        self.logger = logging.getLogger('SellsySynchronizer')
+
+    def load(self, client_id: str) -> Optional[Dict]:
+        """
+        Charge le token enregistré pour un client OAuth.
+
+        Args:
+            client_id: Identifiant client OAuth 2.0 auquel le token doit appartenir
+
+        Returns:
+            Dictionnaire {access_token, refresh_token, expires_at} ou None si absent
+        """
+        try:
+            with open(self.path, "rb") as f:
+                data = orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError) as e:
+            self.logger.warning(f"⚠️ Cache de token illisible, il sera ignoré: {str(e)}")
+            return None
+
+        # Un token obtenu avec d'autres identifiants n'est pas réutilisable
+        if data.get("client_id") != client_id or not data.get("access_token"):
+            return None
+
+        try:
+            expires_at = datetime.fromisoformat(data["expires_at"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        return {
+            "access_token": data["access_token"],
+            "refresh_token": data.get("refresh_token"),
+            "expires_at": expires_at
+        }
+
+    def save(self, client_id: str, access_token: str, refresh_token: Optional[str], expires_at: datetime) -> bool:
+        """
+        Enregistre le token courant.
+
+        Le fichier est écrit à côté puis renommé, de sorte qu'un processus
+        concurrent ne lise jamais un fichier à moitié écrit.
+
+        Args:
+            client_id: Identifiant client OAuth 2.0
+            access_token: Token d'accès
+            refresh_token: Token de rafraîchissement (optionnel)
+            expires_at: Date d'expiration du token d'accès
+
+        Returns:
+            True si l'écriture a réussi, False sinon
+        """
+        content = orjson.dumps({
+            "client_id": client_id,
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_at": expires_at.isoformat()
+        })
+
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            # Fichier temporaire créé avec des droits restreints (le token est un secret)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".token_")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+            return True
+        except OSError as e:
+            self.logger.warning(f"⚠️ Impossible d'enregistrer le token dans le cache: {str(e)}")
+            return False